@@ -94,19 +94,57 @@ def setup(url, token, user_agent_name=None, headers={}):
             user_agent = 'Python:%s' % account_name
         request_headers['User-Agent'] = user_agent
     
-#  these three classes are for typed exceptions  
-class InternalError(Exception):
+#  these classes are for typed exceptions
+class FreshBooksError(Exception):
+    '''
+    Base class for errors returned by the API.  The structured
+    ResponseError is available as the error attribute.
+    '''
+    def __init__(self, msg, error=None):
+        Exception.__init__(self, msg)
+        self.error = error
+
+class InternalError(FreshBooksError):
     pass
-    
-class AuthenticationError(Exception):
+
+class AuthenticationError(FreshBooksError):
     pass
-    
-class UnknownSystemError(Exception):
+
+class UnknownSystemError(FreshBooksError):
     pass
-    
-class InvalidParameterError(Exception):
+
+class InvalidParameterError(FreshBooksError):
     pass
 
+# error code -> exception class, checked first when the response
+# carries a <code> element.  No codes are registered by default since
+# the FreshBooks code list hasn't been confirmed here; add entries as
+# they are, ie ERROR_CODES['<code>'] = AuthenticationError
+ERROR_CODES = {}
+
+# (message fragment, exception class), checked in order when the code
+# is missing or not in ERROR_CODES
+ERROR_MESSAGES = (
+    ('not formatted correctly', InternalError),
+    ('uthentication failed', AuthenticationError),
+    ('does not exist', UnknownSystemError),
+    ('does not exit', UnknownSystemError),
+    ('Invalid parameter', InvalidParameterError),
+)
+
+def classify_error(code, message):
+    '''
+    Return the exception class for an API error code and message
+    '''
+    cls = ERROR_CODES.get(code)
+    if cls:
+        return cls
+    if message:
+        for fragment, cls in ERROR_MESSAGES:
+            if fragment in message:
+                return cls
+    return FreshBooksError
+
 
 def call_api(method, elems = {}):
     '''
@@ -133,20 +171,11 @@ def call_api(method, elems = {}):
     
     # check for failure and throw an exception
     if not last_response.success:
-        msg = last_response.error_message
-        if not msg:
-            raise Exception("Error in response:  %s" % last_response.doc.toxml())
-        if 'not formatted correctly' in msg:
-            raise InternalError(msg)
-        elif 'uthentication failed' in msg:
-            raise AuthenticationError(msg)
-        elif 'does not exit' in msg:
-            raise UnknownSystemError(msg)
-        elif 'Invalid parameter' in msg:
-            raise InvalidParameterError(msg)
-        else:
-            raise Exception(msg)
-            
+        error = last_response.error
+        msg = error.message or "Error in response (code %s, field %s)" % \
+            (error.code, error.field)
+        raise error.exception_class(msg, error)
+
     return last_response
     
 def post(body):
@@ -179,8 +208,10 @@ class Response(object):
         '''
         The constructor, taking in the xml as the source
         '''
+        self._raw = xml_raw
         self._doc = xml_lib.parseString(xml_raw)
-        
+        self._error = None
+
     def __repr__(self):
         '''
         Print the Response and show the XML document
@@ -196,7 +227,14 @@ class Response(object):
         Return the document
         '''
         return self._doc
-    
+
+    @property
+    def raw(self):
+        '''
+        Return the response body as it was received
+        '''
+        return self._raw
+
     @property
     def elements(self):
         '''
@@ -209,19 +247,79 @@ class Response(object):
         '''
         return True if this is a successful response from the API
         '''
-        return self._doc.firstChild.attributes['status'].firstChild.nodeValue == 'ok'
-    
-    @property    
+        return self._doc.documentElement.getAttribute('status') == 'ok'
+
+    @property
+    def error(self):
+        '''
+        returns the ResponseError for a failed API response, or None.
+        Only the top level error, code and field elements are read.
+        '''
+        if self._error is None and not self.success:
+            values = {}
+            for node in self._doc.documentElement.childNodes:
+                if node.nodeType == node.ELEMENT_NODE and \
+                        node.nodeName in ('error', 'code', 'field') and \
+                        node.nodeName not in values:
+                    values[node.nodeName] = ''.join([child.data
+                        for child in node.childNodes
+                        if child.nodeType in (child.TEXT_NODE,
+                            child.CDATA_SECTION_NODE)]).strip() or None
+            self._error = ResponseError(values.get('error'),
+                values.get('code'), values.get('field'), self)
+        return self._error
+
+    @property
     def error_message(self):
         '''
         returns the error message associated with this API response
         '''
-        error = self._doc.getElementsByTagName('error')
+        error = self.error
         if error:
-            return error[0].childNodes[0].nodeValue
+            return error.message
         else:
             return None
-            
+
+
+class ResponseError(object):
+    '''
+    The error details from a failed response
+    '''
+    __slots__ = ('message', 'code', 'field', 'response')
+
+    def __init__(self, message, code=None, field=None, response=None):
+        '''
+        The constructor, taking in the parsed error values and the
+        Response they came from
+        '''
+        self.message = message
+        self.code = code
+        self.field = field
+        self.response = response
+
+    def __repr__(self):
+        '''
+        Print the error without the response document
+        '''
+        return "ResponseError: code: %s, field: %s, message: %s" % \
+            (self.code, self.field, self.message)
+
+    @property
+    def raw(self):
+        '''
+        Return the response body, only looked up when asked for
+        '''
+        if self.response:
+            return self.response.raw
+        return None
+
+    @property
+    def exception_class(self):
+        '''
+        Return the exception class this error should be raised as
+        '''
+        return classify_error(self.code, self.message)
+
 class BaseObject(object):
     '''
     This serves as the base object for all FreshBooks objects.
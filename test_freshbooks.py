@@ -0,0 +1,132 @@
+"""
+Tests for the error handling in freshbooks.py
+"""
+
+import unittest
+
+import freshbooks
+
+
+def fail_response(body):
+    '''
+    Build a failed Response around the given inner XML
+    '''
+    return freshbooks.Response(
+        '<?xml version="1.0" encoding="utf-8"?>'
+        '<response status="fail">%s</response>' % body)
+
+
+class ResponseErrorTests(unittest.TestCase):
+
+    def test_success_has_no_error(self):
+        r = freshbooks.Response('<response status="ok"><client_id>1</client_id></response>')
+        self.assertTrue(r.success)
+        self.assertEqual(r.error, None)
+        self.assertEqual(r.error_message, None)
+
+    def test_error_code_and_field(self):
+        r = fail_response('<error>Client not found.</error>'
+            '<code>50010</code><field>client_id</field>')
+        self.assertFalse(r.success)
+        self.assertEqual(r.error.message, 'Client not found.')
+        self.assertEqual(r.error.code, '50010')
+        self.assertEqual(r.error.field, 'client_id')
+        self.assertEqual(r.error_message, 'Client not found.')
+
+    def test_missing_error_element(self):
+        r = fail_response('<code>50010</code>')
+        self.assertEqual(r.error.message, None)
+        self.assertEqual(r.error.code, '50010')
+        self.assertEqual(r.error.exception_class, freshbooks.FreshBooksError)
+
+    def test_nested_error_ignored(self):
+        r = fail_response('<client><error>nested</error></client>'
+            '<error>top level</error>')
+        self.assertEqual(r.error.message, 'top level')
+
+    def test_nested_error_only(self):
+        r = fail_response('<client><error>nested</error></client>')
+        self.assertEqual(r.error.message, None)
+
+    def test_non_text_children(self):
+        r = fail_response('<error><b>x</b></error>')
+        self.assertEqual(r.error.message, None)
+        r = fail_response('<error>a <!-- c --> b</error>')
+        self.assertEqual(r.error.message, 'a  b')
+        r = fail_response('<error>a <![CDATA[<b>]]> b</error>')
+        self.assertEqual(r.error.message, 'a <b> b')
+
+    def test_raw(self):
+        r = fail_response('<error>Oops</error>')
+        self.assertTrue('<error>Oops</error>' in r.error.raw)
+
+
+class ClassifyErrorTests(unittest.TestCase):
+
+    def tearDown(self):
+        freshbooks.ERROR_CODES.pop('99999', None)
+
+    def test_message_fragments(self):
+        self.assertEqual(freshbooks.classify_error(None, 'Client does not exist.'),
+            freshbooks.UnknownSystemError)
+        self.assertEqual(freshbooks.classify_error(None, 'Client does not exit.'),
+            freshbooks.UnknownSystemError)
+        self.assertEqual(freshbooks.classify_error(None, 'Authentication failed.'),
+            freshbooks.AuthenticationError)
+        self.assertEqual(freshbooks.classify_error(None, 'Invalid parameter: x'),
+            freshbooks.InvalidParameterError)
+        self.assertEqual(freshbooks.classify_error(None, 'Request not formatted correctly'),
+            freshbooks.InternalError)
+
+    def test_unknown(self):
+        self.assertEqual(freshbooks.classify_error(None, 'Something else'),
+            freshbooks.FreshBooksError)
+        self.assertEqual(freshbooks.classify_error(None, None),
+            freshbooks.FreshBooksError)
+
+    def test_code_before_message(self):
+        freshbooks.ERROR_CODES['99999'] = freshbooks.InvalidParameterError
+        self.assertEqual(freshbooks.classify_error('99999', 'Authentication failed.'),
+            freshbooks.InvalidParameterError)
+        self.assertEqual(freshbooks.classify_error('12345', 'Authentication failed.'),
+            freshbooks.AuthenticationError)
+
+
+class CallApiErrorTests(unittest.TestCase):
+
+    def setUp(self):
+        self._post = freshbooks.post
+
+    def tearDown(self):
+        freshbooks.post = self._post
+
+    def call(self, body):
+        freshbooks.post = lambda request: \
+            '<response status="fail">%s</response>' % body
+        return freshbooks.call_api('client.get', {'client_id': 1})
+
+    def test_typed_exception(self):
+        try:
+            self.call('<error>Client does not exist.</error><field>client_id</field>')
+        except freshbooks.UnknownSystemError as e:
+            self.assertEqual(str(e), 'Client does not exist.')
+            self.assertEqual(e.error.field, 'client_id')
+        else:
+            self.fail('no exception raised')
+
+    def test_no_message(self):
+        try:
+            self.call('<code>50010</code><field>client_id</field>')
+        except freshbooks.FreshBooksError as e:
+            self.assertEqual(str(e),
+                'Error in response (code 50010, field client_id)')
+        else:
+            self.fail('no exception raised')
+
+    def test_element_in_error(self):
+        self.assertRaises(freshbooks.FreshBooksError,
+            self.call, '<error><b>x</b></error>')
+
+
+if __name__ == '__main__':
+    unittest.main()